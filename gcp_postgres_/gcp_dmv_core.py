@@ -84,22 +84,22 @@ DMV_sorted = pd.concat([first_four_cols, remaining_cols_sorted], axis=1)
 DMV_sorted.to_sql('FE_DMV_ALL', con=gcp_engine, if_exists='replace', index=False)
 print("DMV_sorted DataFrame uploaded to GCP PostgreSQL database successfully!")
 
-# Create specific DataFrames for Durability, Momentum, and Valuation
-Durability = DMV_sorted[['slug'] + [col for col in DMV_sorted.columns if col.startswith('d_')]]
-Momentum = DMV_sorted[['slug'] + [col for col in DMV_sorted.columns if col.startswith('m_')]]
-Valuation = DMV_sorted[['slug'] + [col for col in DMV_sorted.columns if col.startswith('v_')]]
+# Build one signal matrix for the Durability, Momentum, and Valuation columns
+score_cols = [col for col in DMV_sorted.columns if col[:2] in ('d_', 'm_', 'v_')]
+score_matrix = DMV_sorted[score_cols].to_numpy(dtype=float)
+score_prefixes = np.array([col[:2] for col in score_cols])
 
-# Calculate Scores for Durability, Momentum, and Valuation
-Durability['Durability_Score'] = (Durability.drop('slug', axis=1).sum(axis=1) / (Durability.shape[1] - 1)) * 100
-Momentum['Momentum_Score'] = (Momentum.drop('slug', axis=1).sum(axis=1) / (Momentum.shape[1] - 1)) * 100
-Valuation['Valuation_Score'] = (Valuation.drop('slug', axis=1).sum(axis=1) / (Valuation.shape[1] - 1)) * 100
+def calculate_score(prefix):
+    # Sum of the prefix's signals (NaN skipped) as a percentage of its column count
+    mask = score_prefixes == prefix
+    return np.nansum(score_matrix[:, mask], axis=1) / mask.sum() * 100
 
 # Create DMV Scores DataFrame with 'slug' and the calculated scores
 dmv_scores = pd.DataFrame({
-    'slug': Durability['slug'],
-    'Durability_Score': Durability['Durability_Score'],
-    'Momentum_Score': Momentum['Momentum_Score'],
-    'Valuation_Score': Valuation['Valuation_Score']
+    'slug': DMV_sorted['slug'],
+    'Durability_Score': calculate_score('d_'),
+    'Momentum_Score': calculate_score('m_'),
+    'Valuation_Score': calculate_score('v_')
 })
 
 # Upload the dmv_scores DataFrame to GCP
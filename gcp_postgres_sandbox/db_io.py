@@ -0,0 +1,33 @@
+# Bulk read/load helpers shared by the sandbox DMV scripts
+import csv
+import io
+
+import pandas as pd
+
+# Numeric OHLCV columns, pinned so an all-NULL chunk cannot turn them into object
+OHLCV_DTYPES = {col: 'float64' for col in ['open', 'high', 'low', 'close', 'volume', 'market_cap']}
+
+
+def read_ohlcv(engine, table_name, chunksize=100000):
+    # Fetch the OHLCV table through a server-side cursor so the driver never holds the
+    # whole result set at once; the concatenated frame is still fully in memory.
+    # The streaming option lives on its own connection so later queries stay buffered.
+    with engine.connect() as connection:
+        streamed = connection.execution_options(stream_results=True)
+        chunks = pd.read_sql_query(f'SELECT * FROM "{table_name}"', streamed,
+                                   chunksize=chunksize, dtype=OHLCV_DTYPES)
+        return pd.concat(chunks, ignore_index=True)
+
+
+def psql_insert_copy(table, conn, keys, data_iter):
+    # pandas to_sql method: COPY the rows in on pandas' own connection, so the
+    # table (re)creation and the load share one transaction.
+    # \N marks NULL so empty strings are loaded as empty strings.
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([r'\N' if value is None else value for value in row]
+                                 for row in data_iter)
+    buffer.seek(0)
+    columns = ', '.join(f'"{key}"' for key in keys)
+    table_name = f'"{table.schema}"."{table.name}"' if table.schema else f'"{table.name}"'
+    with conn.connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer)
@@ -0,0 +1,26 @@
+# GCP PostgreSQL connection settings shared by the sandbox DMV scripts
+import functools
+import os
+from collections import namedtuple
+
+Settings = namedtuple('Settings', ['host', 'name', 'name_bt', 'user', 'password', 'port'])
+
+
+@functools.lru_cache(maxsize=None)
+def get_settings():
+    # Read once per process; environment variables override the sandbox defaults
+    return Settings(
+        host=os.getenv('DB_HOST', '34.55.195.199'),       # Public IP of your PostgreSQL instance on GCP
+        name=os.getenv('DB_NAME', 'dbcp'),                # Database name
+        name_bt=os.getenv('DB_NAME_BT', 'cp_backtest'),   # Backtest database name
+        user=os.getenv('DB_USER', 'yogass09'),            # Database username
+        password=os.getenv('DB_PASSWORD', 'jaimaakamakhya'),  # Database password
+        port=int(os.getenv('DB_PORT', '5432')),           # PostgreSQL port
+    )
+
+
+def get_db_url(db_name=None):
+    # SQLAlchemy URL for db_name (defaults to the main database)
+    settings = get_settings()
+    return (f'postgresql+psycopg2://{settings.user}:{settings.password}'
+            f'@{settings.host}:{settings.port}/{db_name or settings.name}')
@@ -11,21 +11,17 @@ import seaborn as sns
 import warnings
 import time
 from sqlalchemy import create_engine
+from db_settings import get_db_url
+from db_io import psql_insert_copy
 
 warnings.filterwarnings('ignore')
 
 # Start time for execution tracking
 start_time = time.time()
 
-# GCP Database Connection Parameters
-db_host = "34.55.195.199"         # Public IP of your PostgreSQL instance on GCP
-db_name = "dbcp"                  # Database name
-db_user = "yogass09"              # Database username
-db_password = "jaimaakamakhya"     # Database password
-db_port = 5432                    # PostgreSQL port
 
 # Create SQLAlchemy engine for PostgreSQL on GCP
-gcp_engine = create_engine(f'postgresql+psycopg2://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}')
+gcp_engine = create_engine(get_db_url(), pool_pre_ping=True)
 
 
 
@@ -80,49 +76,43 @@ DMV_sorted = pd.concat([first_four_cols, remaining_cols_sorted], axis=1)
 
 
 df=DMV_sorted
-# Create new columns 'bullish', 'bearish', and 'neutral' initialized to 0
-df['bullish'] = 0
-df['bearish'] = 0
-df['neutral'] = 0
-
-# Iterate through rows and columns (excluding first four columns: 'id', 'slug', 'name', 'timestamp')
-for index, row in df.iloc[:, 4:].iterrows():  # Start from the 5th column (index 4)
-    for col_name, value in row.items():
-        if value == 1:
-            df.loc[index, 'bullish'] += value
-        elif value == -1:
-            df.loc[index, 'bearish'] += value
-        elif value == 0:
-            df.loc[index, 'neutral'] += value
-            
+# Count bullish (1), bearish (-1) and neutral (0) signals per row
+# (excluding first four columns: 'id', 'slug', 'name', 'timestamp')
+signals = df.iloc[:, 4:]
+signal_arr = signals.to_numpy()
+bullish = np.count_nonzero(signal_arr == 1, axis=1)
+bearish = np.count_nonzero(signal_arr == -1, axis=1)
+neutral = np.count_nonzero(signal_arr == 0, axis=1)
+df = df.assign(bullish=bullish, bearish=bearish, neutral=neutral)
+
 DMV_sorted=df
 DMV_sorted.head()
 DMV_sorted.info()
 
 # Upload the DMV_sorted DataFrame to GCP
-DMV_sorted.to_sql('FE_DMV_ALL', con=gcp_engine, if_exists='replace', index=False)
+DMV_sorted.to_sql('FE_DMV_ALL', con=gcp_engine, if_exists='replace', index=False, method=psql_insert_copy)
 print("DMV_sorted DataFrame uploaded to GCP PostgreSQL database successfully!")
 
-# Create specific DataFrames for Durability, Momentum, and Valuation
-Durability = DMV_sorted[['slug'] + [col for col in DMV_sorted.columns if col.startswith('d_')]]
-Momentum = DMV_sorted[['slug'] + [col for col in DMV_sorted.columns if col.startswith('m_')]]
-Valuation = DMV_sorted[['slug'] + [col for col in DMV_sorted.columns if col.startswith('v_')]]
+# Build one signal matrix for the Durability, Momentum, and Valuation columns
+score_cols = [col for col in DMV_sorted.columns if col[:2] in ('d_', 'm_', 'v_')]
+score_matrix = DMV_sorted[score_cols].to_numpy(dtype=float)
+score_prefixes = np.array([col[:2] for col in score_cols])
 
-# Calculate Scores for Durability, Momentum, and Valuation
-Durability['Durability_Score'] = (Durability.drop('slug', axis=1).sum(axis=1) / (Durability.shape[1] - 1)) * 100
-Momentum['Momentum_Score'] = (Momentum.drop('slug', axis=1).sum(axis=1) / (Momentum.shape[1] - 1)) * 100
-Valuation['Valuation_Score'] = (Valuation.drop('slug', axis=1).sum(axis=1) / (Valuation.shape[1] - 1)) * 100
+def calculate_score(prefix):
+    # Sum of the prefix's signals (NaN skipped) as a percentage of its column count
+    mask = score_prefixes == prefix
+    return np.nansum(score_matrix[:, mask], axis=1) / mask.sum() * 100
 
 # Create DMV Scores DataFrame with 'slug' and the calculated scores
 dmv_scores = pd.DataFrame({
-    'slug': Durability['slug'],
-    'Durability_Score': Durability['Durability_Score'],
-    'Momentum_Score': Momentum['Momentum_Score'],
-    'Valuation_Score': Valuation['Valuation_Score']
+    'slug': DMV_sorted['slug'],
+    'Durability_Score': calculate_score('d_'),
+    'Momentum_Score': calculate_score('m_'),
+    'Valuation_Score': calculate_score('v_')
 })
 
 # Upload the dmv_scores DataFrame to GCP
-dmv_scores.to_sql('FE_DMV_SCORES', con=gcp_engine, if_exists='replace', index=False)
+dmv_scores.to_sql('FE_DMV_SCORES', con=gcp_engine, if_exists='replace', index=False, method=psql_insert_copy)
 print("dmv_scores DataFrame uploaded to GCP PostgreSQL database successfully!")
 
 # End time and duration calculation
@@ -19,6 +19,8 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import warnings
 from sqlalchemy import create_engine
+from db_settings import get_db_url
+from db_io import read_ohlcv
 import pandas as pd
 warnings.filterwarnings('ignore')
 
@@ -29,23 +31,16 @@ start_time = time.time()
 from sqlalchemy import create_engine
 import pandas as pd
 
-# Connection parameters
-db_host = "34.55.195.199"         # Public IP of your PostgreSQL instance on GCP
-db_name = "dbcp"                  # Database name
-db_user = "yogass09"              # Database username
-db_password = "jaimaakamakhya"     # Database password
-db_port = 5432                    # PostgreSQL port
 
 # Create a SQLAlchemy engine for PostgreSQL
-gcp_engine = create_engine(f'postgresql+psycopg2://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}')
+gcp_engine = create_engine(get_db_url(), pool_pre_ping=True)
 
 # @title SQL Query Connection to AWS for Data Listing
 
 # Executing the query and fetching the results directly into a pandas DataFrame
-with gcp_engine.connect() as connection:
-    query = 'SELECT * FROM "1K_coins_ohlcv"'  # Enclose only the table name in double quotes
-    all_coins_ohlcv_filtered = pd.read_sql_query(query, connection)
+all_coins_ohlcv_filtered = read_ohlcv(gcp_engine, '1K_coins_ohlcv')
 
+with gcp_engine.connect() as connection:
     query = "SELECT * FROM crypto_listings_latest_1000"
     top_1000_cmc_rank= pd.read_sql_query(query, connection)
 
@@ -188,11 +183,7 @@ metrics.info()
 
 # @title SQLalchemy to push data to aws db (mysql)
 
-from sqlalchemy import create_engine
-
-
-# Create a SQLAlchemy engine for PostgreSQL
-gcp_engine = create_engine(f'postgresql+psycopg2://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}')
+# Reuse the gcp_engine created above; its pool is disposed at the end of the script
 
 # Write the DataFrame to a new table in the database
 metrics.to_sql('FE_METRICS', con=gcp_engine, if_exists='replace', index=False)
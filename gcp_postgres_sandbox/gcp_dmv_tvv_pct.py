@@ -18,6 +18,8 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import warnings
 from sqlalchemy import create_engine
+from db_settings import get_db_url, get_settings
+from db_io import psql_insert_copy, read_ohlcv
 import pandas as pd
 warnings.filterwarnings('ignore')
 import mysql.connector
@@ -28,24 +30,17 @@ start_time = time.time()
 # @title  AWS/Cloud DB connect
 
 
-# Connection parameters
-db_host = "34.55.195.199"         # Public IP of your PostgreSQL instance on GCP
-db_name = "dbcp"                  # Database name
-db_user = "yogass09"              # Database username
-db_password = "jaimaakamakhya"     # Database password
-db_port = 5432                    # PostgreSQL port
 
 # Create a SQLAlchemy engine for PostgreSQL
-gcp_engine = create_engine(f'postgresql+psycopg2://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}')
+gcp_engine = create_engine(get_db_url(), pool_pre_ping=True)
 
 
 # @title SQL Query Connection to AWS for Data Listing
 
 # Executing the query and fetching the results directly into a pandas DataFrame
-with gcp_engine.connect() as connection:
-    query = 'SELECT * FROM "108_1K_coins_ohlcv"'  # Enclose only the table name in double quotes
-    all_coins_ohlcv_filtered= pd.read_sql_query(query, connection)
+all_coins_ohlcv_filtered = read_ohlcv(gcp_engine, '108_1K_coins_ohlcv')
 
+with gcp_engine.connect() as connection:
     query = "SELECT * FROM crypto_listings_latest_1000"
     top_1000_cmc_rank= pd.read_sql_query(query, connection)
 
@@ -360,6 +355,7 @@ df.info()
 
 # @title  VaR & CVaR
 import pandas as pd
+# All per-slug calculations below reuse the 'grouped' object built on the slug/timestamp-sorted df
 # Calculate percentage change for each cryptocurrency
 df['m_pct_1d'] = grouped['close'].pct_change()
 # Calculate cumulative returns for each cryptocurrency
@@ -369,33 +365,22 @@ df['d_pct_cum_ret'] = (1 + df['m_pct_1d']).groupby(df['slug']).cumprod() - 1
 confidence_level = 0.95
 
 # Calculate Historical VaR for each cryptocurrency
-VaR_df = df.groupby('slug').apply(lambda x: x['m_pct_1d'].quantile(1 - confidence_level))
-VaR_df = VaR_df.reset_index(name='d_pct_var')
-
-# Calculate CVaR for each cryptocurrency
-CVaR_df = df.groupby('slug').apply(lambda x: x['m_pct_1d'][x['m_pct_1d'] <= x['m_pct_1d'].quantile(1 - confidence_level)].mean())
-CVaR_df = CVaR_df.reset_index(name='d_pct_cvar')
+df['d_pct_var'] = grouped['m_pct_1d'].transform('quantile', 1 - confidence_level)
 
-# Merge VaR and CVaR back into the original DataFrame
-df = df.merge(VaR_df, on='slug', how='left')
-df = df.merge(CVaR_df, on='slug', how='left')
+# Calculate CVaR for each cryptocurrency (mean of the returns at or below VaR)
+tail_returns = df['m_pct_1d'].where(df['m_pct_1d'] <= df['d_pct_var'])
+df['d_pct_cvar'] = tail_returns.groupby(df['slug']).transform('mean')
 
 df.info()
 
 import pandas as pd
 import numpy as np
 
-# Assuming your DataFrame is named 'df'
-
-# Ensure 'timestamp' is in datetime format and 'volume' is numeric
-df['timestamp'] = pd.to_datetime(df['timestamp'])
+# Ensure 'volume' is numeric
 df['volume'] = pd.to_numeric(df['volume'])
 
-# Sort by 'timestamp' in ascending order
-df.sort_values(by='timestamp', ascending=True, inplace=True)
-
 # Calculate daily volume percentage (VolD%)
-df['d_pct_vol_1d'] = df.groupby('slug')['volume'].pct_change()
+df['d_pct_vol_1d'] = grouped['volume'].pct_change()
 
 """
 # Calculate the latest weekly volume percentage (VolW%)
@@ -418,18 +403,19 @@ df['d_pct_vol_1m'] = df.groupby('slug').apply(latest_monthly_vol_percentage).res
 df.info()
 
 # @title Keeping Only Latest Date for Each Slug
-# Group by 'slug' and get the row with the maximum timestamp
-pct_change = df.loc[df.groupby('slug')['timestamp'].idxmax()]
+# df is sorted by 'slug' and 'timestamp', so the last row of each slug is its latest date
+pct_change = df.drop_duplicates(subset='slug', keep='last')
 
 pct_change.info()
 
 import numpy as np
-# Drop columns with infinite values
-pct_change = pct_change.replace([np.inf, -np.inf], np.nan)
-
 # Drop columns 4 to 10
 pct_change = pct_change.drop(pct_change.columns[4:10], axis=1)
 
+# Replace infinite values with NaN, scanning only the remaining numeric columns
+num_cols = pct_change.select_dtypes(include='number').columns
+pct_change[num_cols] = pct_change[num_cols].mask(np.isinf(pct_change[num_cols]))
+
 
 
 pct_change.info()
@@ -439,7 +425,7 @@ pct_change.info()
 from sqlalchemy import create_engine
 
 # Write the DataFrame to a new table in the database
-pct_change.to_sql('FE_PCT_CHANGE', con=gcp_engine, if_exists='replace', index=False)
+pct_change.to_sql('FE_PCT_CHANGE', con=gcp_engine, if_exists='replace', index=False, method=psql_insert_copy)
 
 print("pct_change DataFrame uploaded to GCP postGres database successfully!")
 
@@ -466,15 +452,9 @@ gcp_engine.dispose()
 
 
 
- # Connection parameters
-db_host = "34.55.195.199"         # Public IP of your PostgreSQL instance on GCP
-db_name = "cp_backtest"                  # Database name
-db_user = "yogass09"              # Database username
-db_password = "jaimaakamakhya"     # Database password
-db_port = 5432                    # PostgreSQL port
 
 # Create a SQLAlchemy engine for PostgreSQL
-gcp_engine = create_engine(f'postgresql+psycopg2://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}')
+gcp_engine = create_engine(get_db_url(get_settings().name_bt), pool_pre_ping=True)
 
 # Write the DataFrame to a new table in the database
 tvv.to_sql('FE_TVV', con=gcp_engine, if_exists='append', index=False)
@@ -482,7 +462,7 @@ tvv.to_sql('FE_TVV', con=gcp_engine, if_exists='append', index=False)
 tvv_signals.to_sql('FE_TVV_SIGNALS', con=gcp_engine, if_exists='append', index=False)
 
 # Write the DataFrame to a new table in the database
-pct_change.to_sql('FE_PCT_CHANGE', con=gcp_engine, if_exists='append', index=False)
+pct_change.to_sql('FE_PCT_CHANGE', con=gcp_engine, if_exists='append', index=False, method=psql_insert_copy)
 
 
 print("table name to db name append done")